@@ -88,6 +88,36 @@ stator-pole directions that bracket it—those two directions are always separat
 
 from math import cos, sin, sqrt, pi
 
+try:
+    import micropython
+except ImportError:
+    # Not running on MicroPython (e.g. plain CPython): stand in for its code emitter
+    # decorators, so the decorated functions simply run as regular Python code.
+    class micropython:
+        @staticmethod
+        def native(function):
+            return function
+
+# Fixed-point (Q15) representation of a current intensity of 1.0.
+Q15_ONE = 32767
+
+# Constants used when decomposing the magnetic field along the stator pole directions.
+_SQRT2     = sqrt(2)
+_PI_OVER_2 = pi / 2
+_PI_OVER_4 = pi / 4
+
+# Electric cycles already calculated, keyed by (num_microsteps, current_calculator).
+_electric_cycle_cache     = {}
+_electric_cycle_q15_cache = {}
+
+# For each quarter of the electric cycle, the coefficients (a_ccw, a_cw, b_ccw, b_cw) that translate the
+# components (B_ccw, B_cw) of the magnetic field along the two bracketing stator pole directions into
+# phase currents: IA = a_ccw * B_ccw + a_cw * B_cw, IB = b_ccw * B_ccw + b_cw * B_cw.
+_QUARTER_SIGNS = ((+1,  0,  0, +1),   # quarter 1: ccw direction A1 - A3, cw direction B1 - B3
+                  ( 0, -1, +1,  0),   # quarter 2: ccw direction B1 - B3, cw direction A2 - A4
+                  (-1,  0,  0, -1),   # quarter 3: ccw direction A2 - A4, cw direction B2 - B4
+                  ( 0, +1, -1,  0))   # quarter 4: ccw direction B2 - B4, cw direction A1 - A3
+
 def calculate_currents_geometric(cycle_position):
     """
     Calculate phase currents by decomposing the magnetic field along the directions of the stator poles that bracket it.
@@ -104,9 +134,10 @@ def calculate_currents_geometric(cycle_position):
                - IB: Current intensity for Phase B (sin wave), range [-1.0, +1.0]
     """
 
-    # Which quarter of the electric cycle are we in.
-    # This determines in between which stator poles is the direction of the magnetic field. 
-    quarter = int(cycle_position * 4) + 1
+    # Which quarter of the electric cycle are we in, and where within that quarter.
+    # The quarter determines in between which stator poles is the direction of the magnetic field.
+    quarter, position_in_quarter = divmod(cycle_position * 4, 1.0)
+    quarter = int(quarter) + 1
 
     # Consider two axes that form a 45° angle, and a unit vector whose direction lies between them.
     # One axis is positioned counter-clockwise, the other one clockwise relative to the unit vector.
@@ -121,11 +152,10 @@ def calculate_currents_geometric(cycle_position):
     # of the field along the direction that connects opposing poles. Setting the field magnitude to 1, 
     # its components are:
 
-    position_in_quarter = (cycle_position * 4) % 1.0
-    theta = position_in_quarter * pi / 4
+    theta = position_in_quarter * _PI_OVER_4
     
     B_ccw = cos(theta) - sin(theta)
-    B_cw  = sqrt(2) * sin(theta)
+    B_cw  = _SQRT2 * sin(theta)
 
     # Below we translate magnetic field intensity to current intensity.
     # We are working on units where a full current (intensity 1) generates a full magnetic field.
@@ -133,29 +163,11 @@ def calculate_currents_geometric(cycle_position):
     # direction requires flipping the direction of the current through Phase A (as polarities of 
     # poles A1, A2, A3, A4 alternates).
     
-    # ccw direction: line connecting poles A1 - A3
-    # cw  direction: line connecting poles B1 - B3        
-    if quarter == 1:
-        Ia = +B_ccw
-        Ib = +B_cw
-
-    # ccw direction: line connecting poles B1 - B3            
-    # cw  direction: line connecting poles A2 - A4
-    elif quarter == 2:
-        Ia = -B_cw 
-        Ib = +B_ccw
-
-    # ccw  direction: line connecting poles A2 - A4
-    # c2 direction: line connecting poles B2 - B4            
-    elif quarter == 3:
-        Ia = -B_ccw
-        Ib = -B_cw
-
-    # left  direction: line connecting poles B2 - B4            
-    # right direction: line connecting poles A1 - A3
-    elif quarter == 4:
-        Ia = +B_cw
-        Ib = -B_ccw
+    # The coefficients (a_ccw, a_cw, b_ccw, b_cw) for each quarter are looked up in a table,
+    # so the same arithmetic is performed regardless of the quarter (see '_QUARTER_SIGNS').
+    a_ccw, a_cw, b_ccw, b_cw = _QUARTER_SIGNS[quarter - 1]
+    Ia = a_ccw * B_ccw + a_cw * B_cw
+    Ib = b_ccw * B_ccw + b_cw * B_cw
 
     return Ia, Ib
 
@@ -182,6 +194,65 @@ def calculate_currents_sinusoidal(cycle_position):
     return cos(theta), sin(theta)
 
 
+@micropython.native
+def _unit_vectors(step, count):
+    """
+    Calculate the pairs (cos(k*step), sin(k*step)) for k = 0, 1, ..., count-1.
+
+    Rather than calling 'cos' and 'sin' for each angle, the pairs are generated by repeatedly
+    rotating the unit vector by 'step' (angle-addition formulas), which only takes four
+    multiplications and two additions per angle. The sequence starts from the exact (1, 0)
+    and is only used over a quarter of the electric cycle, so rounding errors do not build up.
+
+    This is the loop doing the trigonometry when building an electric cycle, and the one most
+    worth speeding up, so it is compiled to machine code by MicroPython's native code emitter.
+    """
+    cos_step, sin_step = cos(step), sin(step)
+
+    c, s = 1.0, 0.0
+    unit_vectors = [None] * count
+    for k in range(count):
+        unit_vectors[k] = (c, s)
+        c, s = c*cos_step - s*sin_step, s*cos_step + c*sin_step
+    return unit_vectors
+
+def _first_quarter_sinusoidal(num_microsteps):
+    """
+    Same as calling 'calculate_currents_sinusoidal' for every stage in the first quarter
+    of the electric cycle, but with the calculation inlined in one loop.
+    """
+    return _unit_vectors(_PI_OVER_2/num_microsteps, num_microsteps)
+
+def _first_quarter_geometric(num_microsteps):
+    """
+    Same as calling 'calculate_currents_geometric' for every stage in the first quarter
+    of the electric cycle, but with the calculation inlined in one loop.
+    """
+    # In the first quarter the magnetic field lies between the A1 - A3 (ccw) and
+    # the B1 - B3 (cw) directions, in which case (IA, IB) = (B_ccw, B_cw).
+    # The pairs (cos(theta), sin(theta)) are generated together, see '_unit_vectors'.
+    return [(cos_theta - sin_theta, _SQRT2 * sin_theta)
+            for cos_theta, sin_theta in _unit_vectors(_PI_OVER_4/num_microsteps, num_microsteps)]
+
+def _unfold_first_quarter(first_quarter):
+    """
+    Build the complete electric cycle from its first quarter.
+
+    Advancing the electrical angle by 90° rotates the magnetic field by 45°, from between one pair of
+    stator poles to between the next pair. Because the pole polarities alternate, the currents needed
+    in the next quarter are those of the current quarter, rotated by 90°: (IA, IB) -> (-IB, IA).
+    Both calculators defined in this module have this symmetry.
+    """
+    num_microsteps = len(first_quarter)
+
+    electric_cycle = [None] * (4 * num_microsteps)
+    for k, (IA, IB) in enumerate(first_quarter):
+        electric_cycle[k                     ] = ( IA,  IB)
+        electric_cycle[k +     num_microsteps] = (-IB,  IA)
+        electric_cycle[k + 2 * num_microsteps] = (-IA, -IB)
+        electric_cycle[k + 3 * num_microsteps] = ( IB, -IA)
+    return electric_cycle
+
 def calculate_electric_cycle(num_microsteps, current_calculator):
     """
     Generate the sequence of electrical configurations for micro-stepping control.
@@ -198,7 +269,12 @@ def calculate_electric_cycle(num_microsteps, current_calculator):
       - n = 3*num_microsteps: Phase A at  0, Phase B at -1 (270° position)
 
     Between these cardinal points, the provided current calculator function is used
-    to determine the current intensities for smooth transitions.
+    to determine the current intensities for smooth transitions. The cardinal points
+    are written after the whole cycle is generated, so generating it needs no checks
+    for special stages.
+
+    The result only depends on the arguments, so it is calculated once and then cached;
+    subsequent calls with the same arguments return the same (immutable) object.
 
     Parameters:
         num_microsteps (int): Number of micro-steps per full step (a power of 2)
@@ -213,41 +289,75 @@ def calculate_electric_cycle(num_microsteps, current_calculator):
                                           Phase A and Phase B (values between -1.0 and 1.0)
 
     Returns:
-        list: A list of tuples (IA, IB) where:
+        tuple: A tuple of tuples (IA, IB) where:
               - IA: Current intensity for Phase A (-1.0 to +1.0)
               - IB: Current intensity for Phase B (-1.0 to +1.0)
-              The list contains 4*num_microsteps entries representing one
+              The tuple contains 4*num_microsteps entries representing one
               complete electrical cycle.
     """
+    key = (num_microsteps, current_calculator)
+    if key in _electric_cycle_cache:
+        return _electric_cycle_cache[key]
 
     # To move the rotor in full steps, we cycle the electric configuration through 4 stages.
     # When we break a full step into micro-steps, the number of stages increases proportionally
     # (we complete the same electric cycle, but in finer steps).
     num_stages = 4 * num_microsteps
 
-    # For each stage store a tuple (IA, IB): the signed 
-    # intensity of electric curent through each phase.
-    electric_cycle = []
-    
-    for n in range(num_stages):
-               
-        # Regardless of how we compute the intermediate electrical states used to move the rotor
-        # between full steps, the electrical configuration at certain key points in the cycle
-        # is always known: at 0%, 25%, 50%, and 75% of the electrical period, one phase is fully
-        # energized and the other phase is completely off. To avoid floating-point rounding errors, 
-        # we explicitly hard-code the electrical configuration for these special points. 
-        if n == 0:
-            IA, IB = (+1, 0)
-        elif n == num_microsteps:
-            IA, IB = (0, +1)
-        elif n == 2 * num_microsteps:
-            IA, IB = (-1, 0)
-        elif n == 3 * num_microsteps:
-            IA, IB = (0, -1)
-
-        # In between full steps.
-        else:
-            IA, IB = current_calculator(n/num_stages)
-            
-        electric_cycle.append((IA, IB))
+    # For each stage store a tuple (IA, IB): the signed intensity of electric curent through each phase.
+    # The two calculators defined in this module are evaluated by dedicated loops, only over the first
+    # quarter of the cycle; the other three quarters follow by symmetry. Any other calculator is
+    # evaluated in a single pass over all stages.
+    if current_calculator is calculate_currents_sinusoidal:
+        electric_cycle = _unfold_first_quarter(_first_quarter_sinusoidal(num_microsteps))
+    elif current_calculator is calculate_currents_geometric:
+        electric_cycle = _unfold_first_quarter(_first_quarter_geometric(num_microsteps))
+    else:
+        electric_cycle = [current_calculator(n/num_stages) for n in range(num_stages)]
+
+    # Regardless of how we compute the intermediate electrical states used to move the rotor
+    # between full steps, the electrical configuration at certain key points in the cycle
+    # is always known: at 0%, 25%, 50%, and 75% of the electrical period, one phase is fully
+    # energized and the other phase is completely off. To avoid floating-point rounding errors,
+    # we explicitly overwrite the electrical configuration for these special points.
+    electric_cycle[0                 ] = (+1,  0)
+    electric_cycle[    num_microsteps] = ( 0, +1)
+    electric_cycle[2 * num_microsteps] = (-1,  0)
+    electric_cycle[3 * num_microsteps] = ( 0, -1)
+
+    electric_cycle = tuple(electric_cycle)
+    _electric_cycle_cache[key] = electric_cycle
+    return electric_cycle
+
+def calculate_electric_cycle_q15(num_microsteps, current_calculator):
+    """
+    Generate the sequence of electrical configurations for micro-stepping control,
+    with current intensities in Q15 fixed-point format.
+
+    This is the same cycle as returned by 'calculate_electric_cycle', but each current
+    intensity is stored as a signed integer in [-Q15_ONE, +Q15_ONE] (Q15_ONE stands
+    for 1.0). It is not generated without floating point arithmetic: the floating
+    point cycle is calculated first, then each current is multiplied by Q15_ONE and
+    rounded, a one-off conversion done at start-up. The result is cached, like
+    'calculate_electric_cycle'.
+
+    Parameters:
+        num_microsteps (int):          Number of micro-steps per full step (a power of 2)
+        current_calculator (function): See 'calculate_electric_cycle'
+
+    Returns:
+        tuple: A tuple of 4*num_microsteps integer pairs (IA, IB), where:
+              - IA: Current intensity for Phase A (-Q15_ONE to +Q15_ONE)
+              - IB: Current intensity for Phase B (-Q15_ONE to +Q15_ONE)
+    """
+    key = (num_microsteps, current_calculator)
+    if key in _electric_cycle_q15_cache:
+        return _electric_cycle_q15_cache[key]
+
+    # The cardinal points are the exact integers (+/-1, 0) and (0, +/-1) in the
+    # floating point cycle, so they are encoded exactly as (+/-Q15_ONE, 0) etc.
+    electric_cycle = tuple((round(IA * Q15_ONE), round(IB * Q15_ONE))
+                           for IA, IB in calculate_electric_cycle(num_microsteps, current_calculator))
+
+    _electric_cycle_q15_cache[key] = electric_cycle
     return electric_cycle
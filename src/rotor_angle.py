@@ -37,6 +37,11 @@ class RotorAngle:
     This representation allows precise arithmetic on angles — addition, subtraction,
     and comparison — without any loss of accuracy from floating-point rounding.
 
+    Internally, the pair (sector, ticks) is stored as a single integer, the number
+    of ticks from the vertical reference position: (sector - 1) * SECTOR_TICKS + ticks,
+    in [0, TOTAL_TICKS). The sector and the position within it are derived from it
+    on demand; because SECTOR_TICKS is a power of 2, this is just a shift and a mask.
+
     Public Interface:
     -----------------
     Class Constants:
@@ -50,17 +55,33 @@ class RotorAngle:
         SECTOR_SIZE: float
             The size of each sector in degrees; same as size of a full step.
 
+        SECTOR_TICKS_BITS: int, positive
+            The base 2 logarithm of SECTOR_TICKS.
+
         SECTOR_TICKS: int, positive, a power of 2
             The number of discrete ticks within each sector.
 
+        SECTOR_TICKS_MASK: int
+            Bit mask extracting the position within a sector from a number of ticks (SECTOR_TICKS - 1).
+
+        HALF_SECTOR_TICKS: int
+            The number of discrete ticks within half a sector.
+
         TOTAL_TICKS: int
             The total number of discrete ticks around the complete circle.
 
+        TICK_DEGREES: float
+            The size of each tick in degrees.
+
     Properties:
         to_degrees: float
             Returns the rotor angle measured in degrees [0, 360).
             WARNING: For display only - do not use for calculations due to float precision.
 
+        to_ticks: int
+            Returns the rotor angle measured in ticks [0, TOTAL_TICKS).
+            Exact; use it as a key where a hashable angle is needed (RotorAngle itself is mutable).
+
         sector: int
             Returns the current sector number [1, 200].
 
@@ -83,6 +104,28 @@ class RotorAngle:
             Returns:
                 RotorAngle instance with the angle quantized to the nearest tick
 
+        from_micro_degrees(angle):
+            Creates a RotorAngle from an angle in millionths of a degree, using integer arithmetic only.
+            Parameters:
+                angle: int - angle in millionths of a degree
+            Returns:
+                RotorAngle instance with the angle quantized to the nearest tick
+
+        from_steps(steps, microsteps_per_step=1):
+            Creates a RotorAngle from a number of (micro-)steps, using integer arithmetic only.
+            Parameters:
+                steps:               int - angle in micro-steps, measured from the vertical reference position
+                microsteps_per_step: int - number of micro-steps per full step (a power of 2)
+            Returns:
+                RotorAngle instance
+
+        from_ticks(ticks):
+            Creates a RotorAngle from a number of ticks, using integer arithmetic only.
+            Parameters:
+                ticks: int - angle in ticks, measured from the vertical reference position
+            Returns:
+                RotorAngle instance
+
     Methods:
         __init__(sector=1, ticks=0):
             Initialize a RotorAngle with specific sector and tick position.
@@ -102,10 +145,20 @@ class RotorAngle:
             Parameters:
                 clockwise: bool - True for clockwise, False for counter-clockwise
 
+        rotate_within_sector(ticks):
+            Moves the angle to a given position within the sector it lies in.
+            Modifies this instance in-place.
+            Parameters:
+                ticks: int - position within sector [0, SECTOR_TICKS)
+
         __eq__(other):
             Checks equality with another RotorAngle.
             Returns True if both sector and position match exactly.
 
+        __lt__(other), __le__(other), __gt__(other), __ge__(other):
+            Order angles by their clockwise position from the vertical reference, in [0, 360).
+            Lets lists of angles be sorted or searched with 'bisect' directly.
+
         __repr__():
             Returns a string representation for debugging.
 
@@ -117,8 +170,19 @@ class RotorAngle:
     FULL_STEPS_PER_REV = 200                          # the number of full steps the rotor needs to complete a revolution
     SECTOR_COUNT       = FULL_STEPS_PER_REV           # the number of sectors into which we partition the circle
     SECTOR_SIZE        = 360 / SECTOR_COUNT           # the size of a sector, in degrees
-    SECTOR_TICKS       = 2**16                        # number of ticks into which we divide a sector (must be a power of 2)
+    SECTOR_TICKS_BITS  = 16                           # log2 of the number of ticks into which we divide a sector
+    SECTOR_TICKS       = 2**SECTOR_TICKS_BITS         # number of ticks into which we divide a sector (must be a power of 2)
+    SECTOR_TICKS_MASK  = SECTOR_TICKS - 1             # bit mask extracting the position within a sector from a tick count
+    HALF_SECTOR_TICKS  = SECTOR_TICKS >> 1            # number of ticks in half a sector
     TOTAL_TICKS        = SECTOR_COUNT * SECTOR_TICKS  # the total number of discrete ticks around the complete circle
+    TICK_DEGREES       = SECTOR_SIZE / SECTOR_TICKS   # the size of a tick, in degrees
+
+    # Instances only ever hold their position in ticks; no per-instance '__dict__'
+    __slots__ = ('_abs_ticks',)
+
+    # Instances are mutable ('move_one_sector', 'rotate_to_sector_boundary'), so they must not be
+    # hashable; use the 'to_ticks' integer as a key for sets, dictionaries or memoization instead
+    __hash__ = None
 
     @staticmethod
     def is_power_of_2(n):
@@ -142,12 +206,11 @@ class RotorAngle:
             sector: int - sector number (1-based) [1, FULL_STEPS_PER_REV]
             ticks : int - position within sector  [0, SECTOR_RESOLUTION)
         """
-        assert RotorAngle.is_power_of_2(RotorAngle.SECTOR_TICKS)        
         assert isinstance(sector, int) and (1 <= sector <= RotorAngle.SECTOR_COUNT)
         assert isinstance(ticks,  int) and (0 <= ticks  <  RotorAngle.SECTOR_TICKS)
         
-        self._sector = sector   # the sector the rotor is in     (integer in [1, SECTOR_COUNT])
-        self._ticks  = ticks    # the position within the sector (integer in [0, SECTOR_TICKS))
+        # the number of ticks from the vertical reference position (integer in [0, TOTAL_TICKS))
+        self._abs_ticks = ((sector - 1) << RotorAngle.SECTOR_TICKS_BITS) + ticks
 
     @classmethod
     def from_degrees(cls, angle):
@@ -159,24 +222,92 @@ class RotorAngle:
         The input angle quantized to the closest sector tick.
         
         Parameters:
-            angle: float - angle in degrees
+            angle: float or int - angle in degrees
 
         Returns:
             RotorAngle: new instance (input angle quantized to closest tick)
         """
-        # Restrict angle to [0, 360)
-        angle_normalized = angle % 360
+        # Integer angles can be quantized exactly, without going through floats
+        if isinstance(angle, int):
+            return cls.from_ticks(((angle % 360) * cls.TOTAL_TICKS + 180) // 360)
+
+        # Restrict angle to [0, 360); angles are usually at most one turn out of
+        # range, which a single addition or subtraction fixes without a modulo
+        if 0 <= angle < 360:
+            angle_normalized = angle
+        elif -360 <= angle < 0:
+            angle_normalized = angle + 360
+        elif 360 <= angle < 720:
+            angle_normalized = angle - 360
+        else:
+            angle_normalized = angle % 360
+
+        # Convert angle to ticks, rounding to the nearest tick (the angle is not negative,
+        # so truncating after adding 0.5 does it); rounding may land on TOTAL_TICKS,
+        # which 'from_ticks' wraps to 0
+        angle_in_ticks = int(angle_normalized * cls.TOTAL_TICKS / 360 + 0.5)
 
-        # Convert angle to ticks
-        angle_in_ticks = round(angle_normalized * cls.TOTAL_TICKS / 360)
-        if angle_in_ticks >= cls.TOTAL_TICKS:
-            angle_in_ticks = 0
+        return cls.from_ticks(angle_in_ticks)
 
-        # Calculate sector and position within sector
-        sector             = (angle_in_ticks // cls.SECTOR_TICKS) + 1
-        position_in_sector =  angle_in_ticks %  cls.SECTOR_TICKS
+    @classmethod
+    def from_micro_degrees(cls, angle):
+        """
+        Create a RotorAngle from an angle in millionths of a degree.
 
-        return cls(sector=sector, ticks=position_in_sector)
+        Angles are measured relative to the positive vertical axis.
+        A positive angle corresponds to a clockwise rotation.
+        The input angle quantized to the closest sector tick.
+        Unlike 'from_degrees', this involves only integer arithmetic.
+
+        Parameters:
+            angle: int - angle in millionths of a degree
+
+        Returns:
+            RotorAngle: new instance (input angle quantized to closest tick)
+        """
+        # Round to the nearest tick, using integer division only
+        return cls.from_ticks((angle * cls.TOTAL_TICKS + 180000000) // 360000000)
+
+    @classmethod
+    def from_steps(cls, steps, microsteps_per_step=1):
+        """
+        Create a RotorAngle from a number of (micro-)steps measured from the vertical reference position.
+
+        A positive number of steps corresponds to a clockwise rotation.
+        This involves only integer arithmetic and is exact.
+
+        Parameters:
+            steps:               int - angle in micro-steps (can be negative or exceed a revolution)
+            microsteps_per_step: int - number of micro-steps per full step, a power of 2 in [1, SECTOR_TICKS]
+
+        Returns:
+            RotorAngle: new instance
+        """
+        assert cls.is_power_of_2(microsteps_per_step) and microsteps_per_step <= cls.SECTOR_TICKS
+        return cls.from_ticks(steps * (cls.SECTOR_TICKS // microsteps_per_step))
+
+    @classmethod
+    def from_ticks(cls, ticks):
+        """
+        Create a RotorAngle from a number of ticks measured from the vertical reference position.
+
+        A positive number of ticks corresponds to a clockwise rotation.
+        Unlike 'from_degrees', this involves only integer arithmetic.
+
+        Parameters:
+            ticks: int - angle in ticks (can be negative or larger than TOTAL_TICKS)
+
+        Returns:
+            RotorAngle: new instance
+        """
+        assert isinstance(ticks, int)
+
+        # The tick count is all an instance holds, so it is set directly, restricted to
+        # [0, TOTAL_TICKS); '__init__' is bypassed, as it takes a sector and a position
+        # within it, which would have to be split from the tick count only to be joined again
+        angle = cls.__new__(cls)
+        angle._abs_ticks = ticks % cls.TOTAL_TICKS
+        return angle
 
     @property
     def to_degrees(self):
@@ -191,7 +322,20 @@ class RotorAngle:
         Returns:
             float: angle in degrees
         """
-        return (self._sector - 1) * self.SECTOR_SIZE + self.sector_position_in_degrees
+        return (self.sector - 1) * self.SECTOR_SIZE + self.sector_position_in_degrees
+
+    @property
+    def to_ticks(self):
+        """
+        The rotor angle measured in ticks from the vertical reference position.
+
+        Unlike the angle in degrees, this is exact; equal angles have equal ticks,
+        which makes it suitable as a key for sets, dictionaries or memoization.
+
+        Returns:
+            int: angle in ticks [0, TOTAL_TICKS)
+        """
+        return self._abs_ticks
 
     @property
     def sector(self):
@@ -201,7 +345,7 @@ class RotorAngle:
         Returns:
             sector: int - sector number [1, FULL_STEPS_PER_REV]
         """
-        return self._sector
+        return (self._abs_ticks >> self.SECTOR_TICKS_BITS) + 1
 
     @property
     def sector_position_in_ticks(self):
@@ -211,7 +355,7 @@ class RotorAngle:
         Returns:
             int - position within sector in ticks [0, SECTOR_TICKS)
         """
-        return self._ticks
+        return self._abs_ticks & self.SECTOR_TICKS_MASK
 
     @property
     def sector_position_in_degrees(self):
@@ -226,7 +370,7 @@ class RotorAngle:
         Returns:
             float: position within sector in degrees [0, SECTOR_SIZE)
         """
-        return self._ticks * self.SECTOR_SIZE / self.SECTOR_TICKS
+        return (self._abs_ticks & self.SECTOR_TICKS_MASK) * self.TICK_DEGREES
 
     @property
     def sector_half(self):
@@ -238,7 +382,7 @@ class RotorAngle:
         Returns:
             int: 1 for first half, 2 for second half
         """
-        return 1 if self._ticks < self.SECTOR_TICKS // 2 else 2
+        return 1 if (self._abs_ticks & self.SECTOR_TICKS_MASK) < self.HALF_SECTOR_TICKS else 2
 
     def move_one_sector(self, clockwise):
         """
@@ -249,10 +393,17 @@ class RotorAngle:
         Parameters:
             clockwise: bool - True for clockwise movement, False otherwise
         """
+        # The angle moves by less than a full circle, so wrapping
+        # around needs at most one correction instead of a modulo
         if clockwise:
-            self._sector = (self._sector % self.SECTOR_COUNT) + 1
+            abs_ticks = self._abs_ticks + self.SECTOR_TICKS
+            if abs_ticks >= self.TOTAL_TICKS:
+                abs_ticks -= self.TOTAL_TICKS
         else:
-            self._sector = ((self._sector - 2) % self.SECTOR_COUNT) + 1
+            abs_ticks = self._abs_ticks - self.SECTOR_TICKS
+            if abs_ticks < 0:
+                abs_ticks += self.TOTAL_TICKS
+        self._abs_ticks = abs_ticks
 
     def rotate_to_sector_boundary(self, clockwise):
         """
@@ -263,15 +414,26 @@ class RotorAngle:
             clockwise: bool - True for clockwise rotation, False otherwise
         """
         # If already aligned, nothing to do
-        if self._ticks == 0:
+        if (self._abs_ticks & self.SECTOR_TICKS_MASK) == 0:
             return
 
+        # Align at the start of the current sector
+        self._abs_ticks &= ~self.SECTOR_TICKS_MASK
+
         # If rotating clockwise, move to the next sector
         if clockwise:
-            self._sector = (self._sector % self.SECTOR_COUNT) + 1
+            self.move_one_sector(clockwise=True)
 
-        # Align at sector boundary
-        self._ticks = 0
+    def rotate_within_sector(self, ticks):
+        """
+        Move the angle to a given position within the sector it lies in.
+        It modifies this instance in-place.
+
+        Parameters:
+            ticks: int - position within sector [0, SECTOR_TICKS)
+        """
+        assert isinstance(ticks, int) and (0 <= ticks < self.SECTOR_TICKS)
+        self._abs_ticks = (self._abs_ticks & ~self.SECTOR_TICKS_MASK) + ticks
 
     def __eq__(self, other):
         """
@@ -283,16 +445,44 @@ class RotorAngle:
         Returns:
             bool: True iff both sector and position in sector are equal
         """
+        if self is other:
+            return True
         if not isinstance(other, RotorAngle):
             return False
-        return self._sector == other._sector and self._ticks == other._ticks
+        return self._abs_ticks == other._abs_ticks
+
+    # Angles are ordered by their clockwise position from the vertical reference, in [0, 360)
+    def __lt__(self, other):
+        if not isinstance(other, RotorAngle):
+            return NotImplemented
+        return self._abs_ticks < other._abs_ticks
+
+    def __le__(self, other):
+        if not isinstance(other, RotorAngle):
+            return NotImplemented
+        return self._abs_ticks <= other._abs_ticks
+
+    def __gt__(self, other):
+        if not isinstance(other, RotorAngle):
+            return NotImplemented
+        return self._abs_ticks > other._abs_ticks
+
+    def __ge__(self, other):
+        if not isinstance(other, RotorAngle):
+            return NotImplemented
+        return self._abs_ticks >= other._abs_ticks
 
     def __repr__(self):
-        return f"RotorAngle(sector={self._sector}, sector_position={self._ticks})"
+        return "RotorAngle(sector=%d, sector_position=%d)" % (self.sector, self.sector_position_in_ticks)
 
     def __str__(self):
-        s  = f" angle              = {self.to_degrees:.6f}°\n"
-        s += f" sector             = {self._sector}\n"
-        s += f" in-sector position = {self._ticks}\n"
-        s += f" in-sector angle    = {self.sector_position_in_degrees:.6f}°\n"
-        return s
\ No newline at end of file
+        return (" angle              = %.6f°\n"
+                " sector             = %d\n"
+                " in-sector position = %d\n"
+                " in-sector angle    = %.6f°\n") % (self.to_degrees, self.sector,
+                                                     self.sector_position_in_ticks,
+                                                     self.sector_position_in_degrees)
+
+# 'SECTOR_TICKS' being a power of 2 is an invariant of the class, so it
+# is checked once, when the module is loaded, instead of on every instance
+assert RotorAngle.is_power_of_2(RotorAngle.SECTOR_TICKS)
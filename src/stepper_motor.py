@@ -1,7 +1,16 @@
+from array   import array
 from machine import Pin, PWM
-from math    import cos, sin, pi, isinf
+from math    import isinf, sqrt
+import micropython
 import time
 
+try:
+    from time import sleep_us
+except ImportError:
+    # Not running on MicroPython (e.g. unit tests): emulate 'time.sleep_us'.
+    def sleep_us(us):
+        time.sleep(us / 1000000)
+
 from electrical_cycle import calculate_electric_cycle, calculate_currents_sinusoidal, calculate_currents_geometric
 from rotor_angle      import RotorAngle
 
@@ -70,12 +79,14 @@ class StepperMotor:
             Parameters:
                 direction: "cw" (clockwise), "ccw" (counter-clockwise), or "closest"
 
-        spin_rotor(num_revolutions, rpm, direction):
+        spin_rotor(num_revolutions, rpm, direction, num_microsteps=1, acceleration=None):
             Spins the motor continuously for a specified number of revolutions at a given speed.
             Parameters:
                 num_revolutions: Number of complete revolutions (can be fractional or inf)
                 rpm:             Speed in revolutions per minute
                 direction:       "cw" (clockwise) or "ccw" (counter-clockwise)
+                num_microsteps:  Into how many micro-steps to break down each full step (a power of 2)
+                acceleration:    Rate (rpm per second) at which to ramp the speed up and down (None for constant speed)
 
         turn_rotor(target_angle, direction, delay=0.01):
             Positions the rotor to a specific angle with microstepping precision.
@@ -83,6 +94,11 @@ class StepperMotor:
                 target_angle: Target position in degrees (0-360)
                 direction:    how to get there - "cw" (clockwise), "ccw" (counter-clockwise), or "closest"
                 delay:        Time delay between rotation steps in seconds
+
+        run_trajectory(moves):
+            Positions the rotor to a sequence of angles, settling down only after the last one.
+            Parameters:
+                moves: iterable of (target_angle, direction, num_microsteps), as for turn_rotor
     """
 
     # Constants
@@ -90,6 +106,9 @@ class StepperMotor:
     MAX_MICROSTEPS = 2**4    # Maximum number of micro-steps into which we can break a full step (must be a power of 2).
     MIN_DELAY      = 0.01    # Minimum delay between successive steps; needed for the motor to settle down (typically 10ms is safe)
 
+    # For each aligned position (1-4), the phase to energize and its current.
+    _ALIGN_ACTIONS = (('A', +1), ('B', +1), ('A', -1), ('B', -1))
+
     def __init__(self, ain1, ain2, pwma, bin1, bin2, pwmb,
                  electric_cycle_calculator="sinusoidal"):
         """
@@ -123,6 +142,11 @@ class StepperMotor:
         self.pwmb = PWM(Pin(pwmb))
         self.pwmb.freq(StepperMotor.PWM_FREQUENCY)
 
+        # For each phase, the bound methods that set the H-bridge inputs and the
+        # PWM duty cycle, looked up once here rather than on every energization.
+        self._phase_controls = {'A': (self.ain1.value, self.ain2.value, self.pwma.duty_u16),
+                                'B': (self.bin1.value, self.bin2.value, self.pwmb.duty_u16)}
+
         # Pre-calculate the current intensities for phases A and B throughout a complete 
         # electrical cycle, divided into micro-steps. The cycle consists of 4 full steps, 
         # each subdivided into a number of micro-steps (here use maximum number allowed).
@@ -132,12 +156,25 @@ class StepperMotor:
         self.electric_cycle = \
             calculate_electric_cycle(StepperMotor.MAX_MICROSTEPS, self.current_calculator)
 
+        # The 'electric_cycle' array has 4 * MAX_MICROSTEPS entries, a power of 2, so
+        # indices can be wrapped around the cycle with a bitwise AND instead of a modulo.
+        self._cycle_mask = len(self.electric_cycle) - 1
+
+        # For each entry in the 'electric_cycle' array, pre-calculate the H-bridge settings that
+        # produce its currents. They are stored as six parallel arrays, (in1, in2, duty) for Phase A
+        # followed by (in1, in2, duty) for Phase B, so that micro-stepping needs no arithmetic.
+        self._cycle_settings = StepperMotor._h_bridge_settings_table([IA for IA, _ in self.electric_cycle]) + \
+                               StepperMotor._h_bridge_settings_table([IB for _, IB in self.electric_cycle])
+
+        # The H-bridge settings for the micro-steps of a full step, for each place in the electric cycle
+        # a full step can start at and each way of walking through it (see '_step_plan'); filled on demand.
+        self._step_plans = {}
+
         # Energize the motor using the first configuration in the electric cycle.
         # This translates into a mechanical configuration in which one rotor tooth 
         # aligns with one of the poles (actually 2 opposite teeth are both aligned
         # with two opposite poles).
-        self._energize_phase(phase='A', I=1.0)
-        self._energize_phase(phase='B', I=0.0)
+        self._energize_cycle_stage(0)
 
         # Imagine rotating the motor so that the two stator poles aligned with the 
         # rotor teeth lie at the top and bottom of the circular stator. We define 
@@ -171,7 +208,7 @@ class StepperMotor:
         """
         if not self.is_aligned:
             return None
-        return (self.rotor_angle.sector - 1) % 4 + 1
+        return ((self.rotor_angle.sector - 1) & 3) + 1
 
     def align_rotor(self, direction):
         """
@@ -200,26 +237,25 @@ class StepperMotor:
         # choose is controlled via the 'direction' argument: the closest boundary or the boundary positioned 
         # (counter)-clockwise.
 
-        sector_norm  = (self.rotor_angle.sector - 1) % 4 + 1   # normalize sector to 1-4
+        sector_norm  = ((self.rotor_angle.sector - 1) & 3) + 1 # normalize sector to 1-4
         position_ccw = sector_norm                             # the counter-clockwise aligned position (1-4)
-        position_cw  = (sector_norm % 4) + 1                   # the clocwise aligned position (1-4)
+        position_cw  = (sector_norm & 3) + 1                   # the clocwise aligned position (1-4)
 
-        if   direction == "cw" : position = position_cw
-        elif direction == "ccw": position = position_ccw
-        else:                    position = position_ccw if self.rotor_angle.sector_half == 1 else position_cw
+        # Turning to the closest position is turning clockwise when in the second half of the sector.
+        clockwise = direction == "cw" or (direction == "closest" and self.rotor_angle.sector_half == 2)
+        position  = position_cw if clockwise else position_ccw
 
         # Update rotor position
-        self.rotor_angle.rotate_to_sector_boundary(clockwise = (position == position_cw))
+        self.rotor_angle.rotate_to_sector_boundary(clockwise=clockwise)
 
         # Physically move the rotor to the aligned position
-        align_actions  = [('A', +1), ('B', +1), ('A', -1), ('B', -1)]
-        phase, current = align_actions[position-1]
+        phase, current = StepperMotor._ALIGN_ACTIONS[position-1]
         self._energize_phase(phase=phase, I=current)
 
         # Wait for the motor to settle down in the aligned position.
         time.sleep(StepperMotor.MIN_DELAY)
 
-    def spin_rotor(self, num_revolutions, rpm, direction, num_microsteps=1):
+    def spin_rotor(self, num_revolutions, rpm, direction, num_microsteps=1, acceleration=None):
         """
         Spin the rotor for a specified number of revolutions at a given speed.
 
@@ -236,6 +272,13 @@ class StepperMotor:
         when increasing the number of micro-steps. This is due to the fact that we 
         impose a minimum delay between successive micro-steps, to allow the current to 
         settle. With a StepperMotor.MIN_DELAY of 10ms the max rpm is 30.
+
+        By default the rotor is spun at constant speed from the first step to the last.
+        Passing an 'acceleration' instead ramps the speed up linearly from rest to 'rpm'
+        and, unless spinning forever, back down to rest at the end, which helps the rotor
+        keep up with the stator field when starting and stopping. The minimum delay
+        between micro-steps (see above) also limits the ramp: steps cannot be shorter
+        than it allows, so with many micro-steps the ramp is short, or even empty.
         
         Parameters
         ----------
@@ -249,10 +292,14 @@ class StepperMotor:
         num_microsteps: int
             Into how many smaller steps to break down a full step rotation (a power of 2).
             Higher count results in smoother movement.
+        acceleration: float or None
+            How quickly to reach 'rpm', in rpm per second (must be positive).
+            None (the default) to spin at constant speed.
         """
         assert num_revolutions >= 0
         assert rpm > 0
         assert direction in ("cw", "ccw")
+        assert acceleration is None or acceleration > 0
 
         # Convert "revolutions" into "full steps" 
         num_fullsteps = round(num_revolutions * RotorAngle.FULL_STEPS_PER_REV)
@@ -264,7 +311,56 @@ class StepperMotor:
         self.align_rotor(direction)
 
         # ... and continue by turning it one full step at a time
-        self._rotate_full_steps(num_fullsteps, time_per_step, num_microsteps)
+        if acceleration is None:
+            self._rotate_full_steps(num_fullsteps, time_per_step, num_microsteps)
+        else:
+            # Unless spinning forever, at most half of the rotation is spent speeding up
+            max_ramp_steps = num_fullsteps if isinf(num_fullsteps) else num_fullsteps // 2
+            ramp = StepperMotor._acceleration_ramp(time_per_step, num_microsteps, acceleration, max_ramp_steps)
+            self._rotate_full_steps(num_fullsteps, time_per_step, num_microsteps, ramp)
+
+    @staticmethod
+    def _acceleration_ramp(time_per_step, num_microsteps, acceleration, max_steps):
+        """
+        How long each full step takes while accelerating from rest at a constant rate.
+
+        Uses David Austin's approximation ("Generate stepper-motor speed profiles in real
+        time", 2005), in which the duration of each step follows from the previous one
+        with one division, no square roots:
+            c_0 = 0.676 * sqrt(2 * step_angle / acceleration)
+            c_n = c_{n-1} - 2 * c_{n-1} / (4n + 1)
+        The ramp ends once the steps are as short as 'time_per_step', or as short as the
+        'MIN_DELAY' between micro-steps allows, whichever is longer; shorter steps would
+        be clamped to that floor anyway (see '_downtime_us'), so they are left out rather
+        than holding on to a list that, at high speeds, may not even fit in memory.
+        For the same reason the ramp is cut short after 'max_steps' steps, when the
+        rotation ends before the target speed is reached.
+
+        Parameters
+        ----------
+        time_per_step : float - how long a full step takes at the target speed, in seconds
+        num_microsteps: int   - how many micro-steps to take to rotate one full step
+        acceleration  : float - rate of acceleration, in rpm per second
+        max_steps     : int   - the maximum number of full steps in the ramp (or inf)
+
+        Returns
+        -------
+        list: the duration of each full step of the ramp, in seconds (all longer than the
+              time it takes to rotate a full step at the target speed)
+        """
+        # The shortest full step the rotor can actually take, when micro-stepping
+        shortest_step = max(time_per_step, StepperMotor.MIN_DELAY * num_microsteps)
+
+        # The ratio of the step angle (one sector) to the angular acceleration; both in
+        # radians, so the 2*pi cancels out: (2*pi / 200) / (acceleration * 2*pi / 60)
+        step_over_acceleration = 60 / (RotorAngle.FULL_STEPS_PER_REV * acceleration)
+
+        ramp = []
+        step_duration = 0.676 * sqrt(2 * step_over_acceleration)
+        while step_duration > shortest_step and len(ramp) < max_steps:
+            ramp.append(step_duration)
+            step_duration -= 2 * step_duration / (4 * len(ramp) + 1)
+        return ramp
 
     def turn_rotor(self, target_angle, direction, num_microsteps=1):
         """
@@ -289,6 +385,40 @@ class StepperMotor:
         direction:          - in which direction to turn the rotor ("closest", "cw", "ccw")
         num_microsteps: int - into how many smaller steps to break down a full step rotation (a power of 2).        
         """
+        # Position the rotor, then wait for the motor to settle down.
+        if self._move_rotor(target_angle, direction, num_microsteps):
+            time.sleep(StepperMotor.MIN_DELAY)
+
+    def run_trajectory(self, moves):
+        """
+        Positions the rotor to a sequence of angles, one after the other.
+
+        This is equivalent to calling 'turn_rotor' for each move in turn, except that
+        the motor is only left to settle down once, after the last move, rather than
+        after each of them.
+
+        Parameters
+        ----------
+        moves: iterable of (target_angle, direction, num_microsteps) - the arguments of 'turn_rotor' for each move
+        """
+        moved = False
+        for target_angle, direction, num_microsteps in moves:
+            moved = self._move_rotor(target_angle, direction, num_microsteps) or moved
+
+        # Wait for the motor to settle down.
+        if moved:
+            time.sleep(StepperMotor.MIN_DELAY)
+
+    def _move_rotor(self, target_angle, direction, num_microsteps):
+        """
+        Positions the rotor to an arbitrary angle, without waiting for the motor to settle down.
+
+        See 'turn_rotor' for the parameters.
+
+        Returns
+        -------
+        bool: whether the rotor was moved (False if it was at the target angle already)
+        """
         assert direction in ("cw", "ccw", "closest")
 
         # We cannot position the rotor to an arbitrary angle; we
@@ -297,7 +427,7 @@ class StepperMotor:
 
         # Special case: target and current angle are the same
         if target_position == self.rotor_angle:
-            return
+            return False
 
         # Calculate current and target sectors
         current_sector = self.rotor_angle.sector
@@ -306,16 +436,14 @@ class StepperMotor:
         # Special case: rotor is already in the target sector
         if current_sector == target_sector:
             self._rotate_in_sector(target_position.sector_position_in_ticks)
-            time.sleep(StepperMotor.MIN_DELAY)
-            return
+            return True
 
         # Determine direction of rotation if "closest" is specified
+        # (the angles are compared in ticks, which is exact, rather than in degrees)
         if direction == "closest":
-            trgt_degrees = target_position.to_degrees
-            curr_degrees = self.rotor_angle.to_degrees 
-            angle_cw     = (trgt_degrees - curr_degrees) % 360
-            angle_ccw    = (curr_degrees - trgt_degrees) % 360
-            direction    = "cw" if angle_cw <= angle_ccw else "ccw"
+            ticks_cw  = (target_position.to_ticks - self.rotor_angle.to_ticks) % RotorAngle.TOTAL_TICKS
+            ticks_ccw = RotorAngle.TOTAL_TICKS - ticks_cw
+            direction = "cw" if ticks_cw <= ticks_ccw else "ccw"
 
         # Start by aligning the rotor.
         self.align_rotor(direction=direction)
@@ -328,11 +456,9 @@ class StepperMotor:
 
         # Finaly, position rotor within target sector
         self._rotate_in_sector(target_position.sector_position_in_ticks)
+        return True
 
-        # Wait for the motor to settle down.
-        time.sleep(StepperMotor.MIN_DELAY)
-
-    def _rotate_full_steps(self, num_fullsteps, time_per_step, num_microsteps):
+    def _rotate_full_steps(self, num_fullsteps, time_per_step, num_microsteps, ramp=()):
         """
         Rotate an aligned rotor a given number of full steps ('inf' to rotate forever).
 
@@ -344,15 +470,25 @@ class StepperMotor:
         This is due to the fact that we impose a minimum delay between successive 
         micro-steps, to allow the current to settle (see StepperMotor.MIN_DELAY).
 
+        A 'ramp' of step durations can be given to accelerate at the start of the rotation
+        and, unless rotating forever, decelerate at the end (the same steps in reverse).
+        If there are too few full steps for both, the ramp is cut short at the middle.
+
         Parameters
         ----------
         num_fullsteps : int or inf - by how many full steps to rotate the rotor (positive for clockwise)
         time_per_step : float      - how long it takes to rotate by one sector, in seconds
         num_microsteps: int        - how many micro-steps to take to rotate one sector (power of 2)        
+        ramp          : sequence   - how long each of the first full steps takes, in seconds (see '_acceleration_ramp')
         """
         assert self.is_aligned                                         # this method may only be used with an aligned rotor
         assert isinstance(num_fullsteps, int) or isinf(num_fullsteps)  # cannot rotate a fractional number of full steps
 
+        # The number of micro-steps must be a power of two and cannot exceed 'MAX_MICROSTEPS'.
+        # It is checked here, once, rather than by '_rotate_full_step' for every full step.
+        assert RotorAngle.is_power_of_2(num_microsteps)
+        assert num_microsteps <= StepperMotor.MAX_MICROSTEPS
+
         # Trivial case
         if num_fullsteps == 0:
             return
@@ -361,14 +497,52 @@ class StepperMotor:
         direction     = "cw" if num_fullsteps > 0 else "ccw"
         num_fullsteps = abs(num_fullsteps)
 
-        # Rotate one full step at a time using '_rotate_sector',
+        # How long to wait in between micro-steps for the current to settle down. It is the same
+        # for every full step, so it is calculated here, once, rather than by '_rotate_full_step'.
+        downtime_us = StepperMotor._downtime_us(time_per_step, num_microsteps)
+
+        # The waits for the full steps during which the rotor speeds up (and then slows down).
+        # A ramp too long for the rotation is cut short at the middle, before converting it.
+        if not isinf(num_fullsteps):
+            ramp = ramp[:num_fullsteps // 2]
+        ramp_downtimes_us = [StepperMotor._downtime_us(duration, num_microsteps) for duration in ramp]
+
+        # Rotate one full step at a time using '_rotate_full_step',
         # which is responsible for micro-stepping, if any.
-        i = 0
-        while i < num_fullsteps or isinf(num_fullsteps):
-            i += 1
-            self._rotate_full_step(direction, time_per_step, num_microsteps)            
+        rotate_full_step = self._rotate_full_step
+        for ramp_downtime_us in ramp_downtimes_us:
+            rotate_full_step(direction, num_microsteps, ramp_downtime_us)
+        if isinf(num_fullsteps):
+            while True:
+                rotate_full_step(direction, num_microsteps, downtime_us)
+        else:
+            for _ in range(num_fullsteps - 2 * len(ramp_downtimes_us)):
+                rotate_full_step(direction, num_microsteps, downtime_us)
+            for ramp_downtime_us in reversed(ramp_downtimes_us):
+                rotate_full_step(direction, num_microsteps, ramp_downtime_us)
+
+    @staticmethod
+    def _downtime_us(duration, num_microsteps):
+        """
+        How long to wait in between micro-steps, so that a full step takes a given time.
+
+        The wait is never shorter than StepperMotor.MIN_DELAY, so that the current can settle.
+        It is given in microseconds, as an integer, so that no floating point arithmetic
+        is needed when waiting.
 
-    def _rotate_full_step(self, direction, duration, num_microsteps):
+        Parameters
+        ----------
+        duration      : float - how long it takes to complete the full step (in seconds)
+        num_microsteps: int   - how many micro-steps to take to rotate one full step
+
+        Returns
+        -------
+        int: how long to wait after each micro-step, in microseconds
+        """
+        return round(max(duration/num_microsteps, StepperMotor.MIN_DELAY) * 1000000)
+
+    @micropython.native
+    def _rotate_full_step(self, direction, num_microsteps, downtime_us):
         """
         Rotate an aligned rotor by one full step.
 
@@ -377,22 +551,23 @@ class StepperMotor:
         into smaller steps (micro-stepping). The number of micro-steps must be a
         power of 2, no larger than MAX_MICROSTEPS.
 
-        Completing the full step might take longer than the duration requested 
-        via the argument, especially when increasing the number of micro-steps. 
-        This is due to the fact that we impose a minimum delay between successive 
-        micro-steps, to allow the current to settle (see StepperMotor.MIN_DELAY)
-        
+        The time it takes to complete the full step is given by the wait after each
+        micro-step, which the caller calculates once per rotation (see '_downtime_us').
+
+        This method contains the micro-stepping loop, which runs once for every micro-step,
+        so it is compiled to machine code by MicroPython's native code emitter.
+
         Parameters
         ----------
-        direction     : str   - direction of rotation ("cw" or "ccw")
-        duration      : float - how long it takes to complete the full step (in seconds)
-        num_microsteps: int   - how many micro-steps to take to rotate one full step (power of 2)
+        direction     : str - direction of rotation ("cw" or "ccw")
+        num_microsteps: int - how many micro-steps to take to rotate one full step (power of 2)
+        downtime_us   : int - how long to wait after each micro-step (in microseconds)
         """
-        # The number of micro-steps must be a power of two and cannot exceed 'MAX_MICROSTEPS'.
-        assert RotorAngle.is_power_of_2(num_microsteps)
-        assert num_microsteps <= StepperMotor.MAX_MICROSTEPS
-        assert direction in ('cw', 'ccw')
-        assert self.is_aligned   # this method may only be used with an aligned rotor
+        # The arguments are not validated here, as this method runs once for every full step;
+        # its caller, '_rotate_full_steps', validates them once for the whole rotation.
+
+        # Class constants used below, bound to a local name (cheaper to look up).
+        max_microsteps = StepperMotor.MAX_MICROSTEPS
 
         # Get the current sector and calculate which quarter of the electric cycle we're in.
         # The electric cycle has a period of 4 sectors:
@@ -400,42 +575,81 @@ class StepperMotor:
         #   Sectors 2, 6, 10, 14... start at quarter 2 (Phase A= 0, Phase B=+1)
         #   Sectors 3, 7, 11, 15... start at quarter 3 (Phase A=-1, Phase B= 0)
         #   Sectors 4, 8, 12, 16... start at quarter 4 (Phase A= 0, Phase B=-1)
+        # (4 is a power of 2, so 'x & 3' gives the same result as 'x % 4', here and elsewhere).
         current_sector   = self.rotor_angle.sector
-        starting_quarter = ((current_sector - 1) % 4) + 1  # 1-4
+        starting_quarter = ((current_sector - 1) & 3) + 1  # 1-4
 
         # Calculate the offset in the 'electric_cycle' array due to
         # which quarter of the electric cycle we are currently in.
         # The array has 4 * MAX_MICROSTEPS entries for one complete
         # electrical cycle => each quarter has MAX_MICROSTEPS entries.
-        offset = (starting_quarter - 1) * StepperMotor.MAX_MICROSTEPS
+        offset = (starting_quarter - 1) * max_microsteps
 
         # Calculate how many entries to skip in the 'electric_cycle'
         # array when using fewer microsteps than MAX_MICROSTEPS.
-        stride = StepperMotor.MAX_MICROSTEPS // num_microsteps
-
-        # how long to wait in between steps for current to settle down.
-        downtime = max(duration/num_microsteps, StepperMotor.MIN_DELAY)
+        # Rotating counter-clockwise walks the array backwards.
+        stride = max_microsteps // num_microsteps
+        if direction == 'ccw':
+            stride = -stride
+
+        # The H-bridge settings for each micro-step of the full step depend only on where in the
+        # electric cycle we start and on how we walk through it; they are worked out the first
+        # time a full step starting at 'offset' is taken with a given 'stride', and reused afterwards.
+        step_plan = self._step_plans.get((offset, stride))
+        if step_plan is None:
+            step_plan = self._step_plan(offset, stride, num_microsteps)
+
+        # Bind what the loop below uses to local names, which are cheaper to look up.
+        set_a_in1, set_a_in2, set_a_duty = self._phase_controls['A']
+        set_b_in1, set_b_in2, set_b_duty = self._phase_controls['B']
+        sleep = sleep_us
 
         # Rotate one microstep at a time.
-        for microstep in range(num_microsteps):
+        for a_in1, a_in2, a_duty, b_in1, b_in2, b_duty in step_plan:
 
-            # Calculate the index into the 'electric_cycle' array
-            if direction == 'cw':
-                cycle_index = (offset + (microstep + 1) * stride) % len(self.electric_cycle)
-            else:
-                cycle_index = (offset - (microstep + 1) * stride) % len(self.electric_cycle)
-
-            # Energize stator phases
-            IA, IB = self.electric_cycle[cycle_index]
-            self._energize_phase(phase='A', I=IA)
-            self._energize_phase(phase='B', I=IB)
+            # Energize stator phases, using the pre-calculated H-bridge settings
+            set_a_in1(a_in1); set_a_in2(a_in2); set_a_duty(a_duty)
+            set_b_in1(b_in1); set_b_in2(b_in2); set_b_duty(b_duty)
 
             # Wait before next micro-step
-            time.sleep(downtime)
+            sleep(downtime_us)
 
         # Update the rotor angle to reflect the new position
         self.rotor_angle.move_one_sector(clockwise=(direction == 'cw'))
 
+    def _step_plan(self, offset, stride, num_microsteps):
+        """
+        The H-bridge settings for each micro-step of a full step, in the order they are applied.
+
+        The plan is cached, so it is only worked out the first time it is needed.
+
+        Parameters
+        ----------
+        offset        : int - index in the 'electric_cycle' array where the full step starts
+        stride        : int - by how many entries of the 'electric_cycle' array each micro-step
+                              advances (negative when rotating counter-clockwise)
+        num_microsteps: int - how many micro-steps to take to rotate one full step
+
+        Returns
+        -------
+        tuple: for each micro-step, a tuple (in1, in2, duty) for Phase A followed by (in1, in2, duty) for Phase B
+        """
+        a_in1, a_in2, a_duty, b_in1, b_in2, b_duty = self._cycle_settings
+
+        step_plan   = []
+        cycle_index = offset
+        for _ in range(num_microsteps):
+
+            # Advance the index into the 'electric_cycle' array (wrapped around the cycle)
+            cycle_index = (cycle_index + stride) & self._cycle_mask
+
+            step_plan.append((a_in1[cycle_index], a_in2[cycle_index], a_duty[cycle_index],
+                              b_in1[cycle_index], b_in2[cycle_index], b_duty[cycle_index]))
+
+        step_plan = tuple(step_plan)
+        self._step_plans[(offset, stride)] = step_plan
+        return step_plan
+
     def _rotate_in_sector(self, target_ticks):
         """
         Position the rotor inside a sector.
@@ -449,8 +663,12 @@ class StepperMotor:
         ----------
         target_ticks: int - target position within the sector [0, RotorAngle.SECTOR_TICKS)
         """
+        # Class constants used below, bound to local names (cheaper to look up).
+        max_microsteps = StepperMotor.MAX_MICROSTEPS
+        sector_ticks   = RotorAngle.SECTOR_TICKS
+
         assert isinstance(target_ticks, int)
-        assert 0 <= target_ticks < RotorAngle.SECTOR_TICKS
+        assert 0 <= target_ticks < sector_ticks
 
         # Trivial case, the rotor is already in the target position
         if target_ticks == self.rotor_angle.sector_position_in_ticks:
@@ -459,16 +677,22 @@ class StepperMotor:
         # As the electrical cycle advances, the rotor moves by one full mechanical step (sector) 
         # for each quarter of the electrical cycle. Therefore, the sector in which the rotor is 
         # currently located tells us which quarter of the electrical cycle we are in.        
-        electric_cycle_quarter = (self.rotor_angle.sector - 1) % 4 + 1     # 1-4
-        electric_cycle_index   = (electric_cycle_quarter  - 1 + target_ticks / RotorAngle.SECTOR_TICKS) * 0.25
-
-        # Energize stator phases        
-        IA, IB = self.current_calculator(electric_cycle_index)
-        self._energize_phase(phase='A', I=IA)
-        self._energize_phase(phase='B', I=IB)
+        electric_cycle_quarter = ((self.rotor_angle.sector - 1) & 3) + 1   # 1-4
+
+        # If the target position falls exactly on a micro-step, the currents are already tabulated
+        # in the 'electric_cycle' array. Otherwise calculate them for the exact target position.
+        ticks_per_microstep  = sector_ticks // max_microsteps
+        microstep, remainder = divmod(target_ticks, ticks_per_microstep)
+        if remainder == 0:
+            self._energize_cycle_stage((electric_cycle_quarter - 1) * max_microsteps + microstep)
+        else:
+            cycle_position = (electric_cycle_quarter - 1 + target_ticks / sector_ticks) * 0.25
+            IA, IB = self.current_calculator(cycle_position)
+            self._energize_phase(phase='A', I=IA)
+            self._energize_phase(phase='B', I=IB)
 
-        # Update rotor state
-        self.rotor_angle = RotorAngle(self.rotor_angle.sector, target_ticks)
+        # Update rotor state (in-place, like the other rotations do)
+        self.rotor_angle.rotate_within_sector(target_ticks)
 
     def _energize_phase(self, phase, I):
         """
@@ -481,16 +705,68 @@ class StepperMotor:
         assert phase in ('A', 'B')
         assert abs(I) <= 1.0
  
-        # Select the pins that control the current through the given phase. 
-        in1 = self.ain1 if phase == 'A' else self.bin1
-        in2 = self.ain2 if phase == 'A' else self.bin2
-        pwm = self.pwma if phase == 'A' else self.pwmb
-                
-        # Set current direction based on sign
-        in1.value(1 if I >= 0 else 0)
-        in2.value(0 if I >= 0 else 1)
-         
-        # Set PWM duty cycle (0-65535 for 16-bit)
+        # Select the pins that control the current through the given phase.
+        set_in1, set_in2, set_duty = self._phase_controls[phase]
+
+        in1, in2, duty = StepperMotor._h_bridge_settings(I)
+        set_in1(in1)
+        set_in2(in2)
+        set_duty(duty)
+
+    def _energize_cycle_stage(self, cycle_index):
+        """
+        Set the currents through both motor phases to those of a stage of the electric cycle.
+
+        Uses the H-bridge settings pre-calculated for the 'electric_cycle' array,
+        so, unlike '_energize_phase', it needs no arithmetic nor validation.
+
+        Parameters:
+            cycle_index: index into the 'electric_cycle' array [0, 4 * MAX_MICROSTEPS)
+        """
+        a_in1, a_in2, a_duty, b_in1, b_in2, b_duty = self._cycle_settings
+        set_a_in1, set_a_in2, set_a_duty = self._phase_controls['A']
+        set_b_in1, set_b_in2, set_b_duty = self._phase_controls['B']
+
+        set_a_in1(a_in1[cycle_index]); set_a_in2(a_in2[cycle_index]); set_a_duty(a_duty[cycle_index])
+        set_b_in1(b_in1[cycle_index]); set_b_in2(b_in2[cycle_index]); set_b_duty(b_duty[cycle_index])
+
+    @staticmethod
+    def _h_bridge_settings(I):
+        """
+        The H-bridge settings that drive a given current through a motor phase.
+
+        Parameters:
+            I: Current intensity as ratio of maximum intensity (-1.0 to +1.0)
+
+        Returns:
+            tuple: (in1, in2, duty) - values of the two H-bridge inputs and the PWM duty cycle
+        """
+        # Current direction based on sign
+        in1 = 1 if I >= 0 else 0
+        in2 = 0 if I >= 0 else 1
+
+        # PWM duty cycle (0-65535 for 16-bit)
         # Use absolute value since direction is handled by IN pins
         duty = int(abs(I) * 65535)
-        pwm.duty_u16(duty)
+
+        return in1, in2, duty
+
+    @staticmethod
+    def _h_bridge_settings_table(currents):
+        """
+        The H-bridge settings that drive a sequence of currents through a motor phase.
+
+        Parameters:
+            currents: sequence of current intensities (-1.0 to +1.0)
+
+        Returns:
+            tuple: (in1, in2, duty) - three arrays, holding for each current the values
+                   of the two H-bridge inputs and the PWM duty cycle (see '_h_bridge_settings')
+        """
+        # The currents are validated here, once, so the tables can be used without further checks
+        assert all(abs(I) <= 1.0 for I in currents)
+
+        settings = [StepperMotor._h_bridge_settings(I) for I in currents]
+        return (array('B', [in1  for in1, _, _  in settings]),
+                array('B', [in2  for _, in2, _  in settings]),
+                array('H', [duty for _, _, duty in settings]))
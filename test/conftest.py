@@ -2,7 +2,7 @@
 pytest configuration file for stepper motor tests.
 
 This file sets up the test environment by:
-1. Ensuring the machine module is mocked before any imports
+1. Ensuring the machine and micropython modules are mocked before any imports
 2. Providing common fixtures for tests
 3. Mocking time.sleep for fast test execution
 """
@@ -18,8 +18,9 @@ source_dir = os.path.join(parent_dir, 'src')
 sys.path.insert(0, parent_dir)
 sys.path.insert(0, source_dir)
 
-# Import our mock module
+# Import our mock modules
 import machine_mock
+import micropython_mock
 
 def pytest_configure(config):
     """
@@ -28,8 +29,9 @@ def pytest_configure(config):
     Sets up the mock machine module in sys.modules to ensure
     it's available for all test imports.
     """
-    # Replace the machine module with our mock
-    sys.modules['machine'] = machine_mock
+    # Replace the machine and micropython modules with our mocks
+    sys.modules['machine']     = machine_mock
+    sys.modules['micropython'] = micropython_mock
 
     # Optionally add markers for test categorization
     config.addinivalue_line(
@@ -3,20 +3,40 @@ Mock implementation of MicroPython's machine module for testing.
 
 This module provides mock Pin and PWM classes that simulate the behavior
 of MicroPython's hardware control classes without requiring actual hardware.
+
+Operations are recorded as tuples, (type, field1, field2, ...), which are much
+cheaper to create than dictionaries; 'get_operations' converts them to dictionaries,
+{'type': type, name1: field1, ...}, using the field names listed for each type.
 """
 
+def _operations_as_dicts(operations, field_names):
+    """
+    Convert operations recorded as tuples into dictionaries.
+    Parameters:
+        operations:  list of tuples (type, field1, field2, ...)
+        field_names: dictionary mapping each operation type to the names of its fields
+    Returns:
+        list of dictionaries {'type': type, name1: field1, ...}
+    """
+    return [dict(zip(('type',) + field_names[op[0]], op)) for op in operations]
+
 class Pin:
     """
     Mock Pin class that simulates a GPIO pin.
     Tracks all operations for verification in tests.
     """
 
+    # Instances only hold these attributes (smaller and faster to access than a '__dict__')
+    __slots__ = ('pin_num', 'mode', '_value')
+
     # Pin modes (matching MicroPython constants)
     IN  = 0
     OUT = 1
 
-    # Class-level tracking of all pin operations
-    _operations = []
+    # Class-level tracking of all pin operations, and the names of their fields
+    _operations       = []
+    _OPERATION_FIELDS = {'init':      ('pin', 'mode'),
+                         'value_set': ('pin', 'value')}
 
     def __init__(self, pin_num, mode=None):
         """
@@ -30,7 +50,7 @@ class Pin:
         self._value  = 0
         
         # Track initialization
-        Pin._operations.append({'type': 'init', 'pin': pin_num, 'mode': mode})
+        Pin._operations.append(('init', pin_num, mode))
 
     def value(self, val=None):
         """
@@ -43,18 +63,23 @@ class Pin:
         """
         if val is not None:
             self._value = val
-            Pin._operations.append({'type': 'value_set', 'pin': self.pin_num, 'value': val})
+            Pin._operations.append(('value_set', self.pin_num, val))
         return self._value
 
     @classmethod
     def reset_tracking(cls):
         """Reset operation tracking."""
-        cls._operations = []
+        cls._operations.clear()
 
     @classmethod
     def get_operations(cls):
         """Get list of all pin operations."""
-        return cls._operations.copy()
+        return _operations_as_dicts(cls._operations, cls._OPERATION_FIELDS)
+
+    @classmethod
+    def count_operations(cls):
+        """Get number of pin operations; cheaper than 'get_operations' when only checking for changes."""
+        return len(cls._operations)
 
 class PWM:
     """
@@ -62,8 +87,14 @@ class PWM:
     Tracks all PWM operations for verification in tests.
     """
 
-    # Class-level tracking of all PWM operations
-    _operations = []
+    # Instances only hold these attributes (smaller and faster to access than a '__dict__')
+    __slots__ = ('pin', '_freq', '_duty_u16')
+
+    # Class-level tracking of all PWM operations, and the names of their fields
+    _operations       = []
+    _OPERATION_FIELDS = {'init':     ('pin',),
+                         'freq_set': ('pin', 'frequency'),
+                         'duty_set': ('pin', 'duty_u16')}
 
     def __init__(self, pin_obj):
         """
@@ -73,11 +104,10 @@ class PWM:
         """
         self.pin       = pin_obj
         self._freq     = 0
-        self._duty     = 0
         self._duty_u16 = 0
 
         # Track initialization
-        PWM._operations.append({'type': 'init','pin': pin_obj.pin_num})
+        PWM._operations.append(('init', pin_obj.pin_num))
 
     def freq(self, frequency=None):
         """
@@ -92,7 +122,7 @@ class PWM:
         """
         if frequency is not None:
             self._freq = frequency
-            PWM._operations.append({'type':'freq_set','pin':self.pin.pin_num,'frequency':frequency})
+            PWM._operations.append(('freq_set', self.pin.pin_num, frequency))
         return self._freq
 
     def duty_u16(self, duty=None):
@@ -108,21 +138,24 @@ class PWM:
         """
         if duty is not None:
             self._duty_u16 = duty
-            self._duty = duty / 65535.0  # Convert to 0.0-1.0 range
             # Track duty cycle changes
-            PWM._operations.append({'type': 'duty_set','pin': self.pin.pin_num,
-                                    'duty_u16': duty,'duty_percent': self._duty * 100})
+            PWM._operations.append(('duty_set', self.pin.pin_num, duty))
         return self._duty_u16
 
     @classmethod
     def reset_tracking(cls):
         """Reset operation tracking (useful between tests)."""
-        cls._operations = []
+        cls._operations.clear()
 
     @classmethod
     def get_operations(cls):
         """Get list of all PWM operations."""
-        return cls._operations.copy()
+        return _operations_as_dicts(cls._operations, cls._OPERATION_FIELDS)
+
+    @classmethod
+    def count_operations(cls):
+        """Get number of PWM operations; cheaper than 'get_operations' when only checking for changes."""
+        return len(cls._operations)
 
 # ==============================
 #  Helper functions for testing
@@ -139,6 +172,10 @@ def get_all_operations():
     return {'pin_operations': Pin.get_operations(),
             'pwm_operations': PWM.get_operations()}
 
+def count_all_operations():
+    """Get the total number of operations from all mock classes."""
+    return Pin.count_operations() + PWM.count_operations()
+
 def print_operations():
     """Print all tracked operations (useful for debugging tests)."""
     ops = get_all_operations()
@@ -149,4 +186,6 @@ def print_operations():
 
     print("\n=== PWM Operations ===")
     for op in ops['pwm_operations']:
+        if op['type'] == 'duty_set':
+            op['duty_percent'] = op['duty_u16'] / 65535.0 * 100  # only needed for display
         print(f"  {op}")
\ No newline at end of file
@@ -0,0 +1,18 @@
+"""
+Mock implementation of MicroPython's micropython module for testing.
+
+On the Pico 2 the decorators below select the code emitter used to compile
+a function. Under CPython they leave the decorated function unchanged.
+"""
+
+def native(func):
+    """Mock of @micropython.native: returns the function unchanged."""
+    return func
+
+def viper(func):
+    """Mock of @micropython.viper: returns the function unchanged."""
+    return func
+
+def const(value):
+    """Mock of micropython.const: returns the value unchanged."""
+    return value
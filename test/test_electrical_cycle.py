@@ -0,0 +1,83 @@
+"""
+Unit tests for the electrical cycle calculations.
+
+These tests check that the pre-computed electric cycle agrees with
+the per-position current calculators it is derived from.
+"""
+
+import os, pytest, sys
+from math import isclose
+
+# Add the parent and 'src' directory to the path
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+source_dir = os.path.join(parent_dir, 'src')
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, source_dir)
+
+# Before importing electrical_cycle, replace micropython module with our mock
+import micropython_mock
+sys.modules['micropython'] = micropython_mock
+
+from electrical_cycle import calculate_electric_cycle, calculate_electric_cycle_q15, Q15_ONE
+from electrical_cycle import calculate_currents_sinusoidal, calculate_currents_geometric
+
+CALCULATORS = [calculate_currents_sinusoidal, calculate_currents_geometric]
+
+
+class TestElectricCycle:
+    """Test the electric cycle generated for micro-stepping."""
+
+    @pytest.mark.parametrize("current_calculator", CALCULATORS)
+    @pytest.mark.parametrize("num_microsteps", [1, 2, 4, 16, 64])
+    def test_cycle_matches_calculator(self, current_calculator, num_microsteps):
+        """Test that every stage of the cycle matches the calculator it was built with."""
+        num_stages     = 4 * num_microsteps
+        electric_cycle = calculate_electric_cycle(num_microsteps, current_calculator)
+
+        assert len(electric_cycle) == num_stages
+        for n, (IA, IB) in enumerate(electric_cycle):
+            IA_expected, IB_expected = current_calculator(n / num_stages)
+            assert isclose(IA, IA_expected, abs_tol=1e-12)
+            assert isclose(IB, IB_expected, abs_tol=1e-12)
+
+    @pytest.mark.parametrize("current_calculator", CALCULATORS)
+    @pytest.mark.parametrize("num_microsteps", [1, 2, 16])
+    def test_cycle_cardinal_points_are_exact(self, current_calculator, num_microsteps):
+        """Test that the full-step configurations are exact, free of rounding errors."""
+        electric_cycle = calculate_electric_cycle(num_microsteps, current_calculator)
+
+        assert tuple(electric_cycle[0                 ]) == (+1,  0)
+        assert tuple(electric_cycle[    num_microsteps]) == ( 0, +1)
+        assert tuple(electric_cycle[2 * num_microsteps]) == (-1,  0)
+        assert tuple(electric_cycle[3 * num_microsteps]) == ( 0, -1)
+
+    def test_cycle_with_custom_calculator(self):
+        """Test that a calculator not defined in the module is still supported."""
+        electric_cycle = calculate_electric_cycle(2, lambda cycle_position: (0.5, 0.5))
+
+        assert len(electric_cycle) == 8
+        assert tuple(electric_cycle[1]) == (0.5, 0.5)
+        assert tuple(electric_cycle[2]) == (0, +1)
+
+    def test_cycle_is_cached(self):
+        """Test that repeated calls with the same arguments return the same cycle."""
+        electric_cycle = calculate_electric_cycle(8, calculate_currents_geometric)
+
+        assert isinstance(electric_cycle, tuple)
+        assert calculate_electric_cycle(8, calculate_currents_geometric) is electric_cycle
+        assert calculate_electric_cycle(8, calculate_currents_sinusoidal) is not electric_cycle
+
+    @pytest.mark.parametrize("current_calculator", CALCULATORS)
+    def test_q15_cycle_matches_float_cycle(self, current_calculator):
+        """Test that the fixed-point cycle is the floating point cycle scaled to Q15."""
+        electric_cycle     = calculate_electric_cycle    (16, current_calculator)
+        electric_cycle_q15 = calculate_electric_cycle_q15(16, current_calculator)
+
+        assert len(electric_cycle_q15) == len(electric_cycle)
+        for (IA, IB), (IA_q15, IB_q15) in zip(electric_cycle, electric_cycle_q15):
+            assert isinstance(IA_q15, int) and isinstance(IB_q15, int)
+            assert abs(IA_q15 - IA * Q15_ONE) <= 0.5
+            assert abs(IB_q15 - IB * Q15_ONE) <= 0.5
+
+        assert electric_cycle_q15[0 ] == (+Q15_ONE, 0)
+        assert electric_cycle_q15[16] == (0, +Q15_ONE)
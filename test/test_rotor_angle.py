@@ -0,0 +1,137 @@
+"""
+Unit tests for RotorAngle class.
+
+These tests check the fixed-precision angle representation
+and the arithmetic performed on it.
+"""
+
+import os, pytest, sys
+
+# Add the parent and 'src' directory to the path
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+source_dir = os.path.join(parent_dir, 'src')
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, source_dir)
+
+from rotor_angle import RotorAngle
+
+
+class TestRotorAngleConstruction:
+    """Test the different ways of creating a RotorAngle."""
+
+    @pytest.mark.parametrize("ticks, sector, ticks_in_sector", [
+        (0,                                                1,                        0),
+        (RotorAngle.SECTOR_TICKS - 1,                      1,                        RotorAngle.SECTOR_TICKS - 1),
+        (RotorAngle.SECTOR_TICKS,                          2,                        0),
+        (RotorAngle.TOTAL_TICKS - 1,                       RotorAngle.SECTOR_COUNT,  RotorAngle.SECTOR_TICKS - 1),
+        (RotorAngle.TOTAL_TICKS,                           1,                        0),
+        (-1,                                               RotorAngle.SECTOR_COUNT,  RotorAngle.SECTOR_TICKS - 1),
+        (3 * RotorAngle.TOTAL_TICKS + 5,                   1,                        5),
+    ])
+    def test_from_ticks(self, ticks, sector, ticks_in_sector):
+        """Test that a tick count is wrapped around the circle and split into sector and position."""
+        angle = RotorAngle.from_ticks(ticks)
+
+        assert angle.sector == sector
+        assert angle.sector_position_in_ticks == ticks_in_sector
+
+    @pytest.mark.parametrize("degrees", [0, 1.8, 90, 359.9, -1.8, 720, 10.123])
+    def test_from_degrees_matches_from_ticks(self, degrees):
+        """Test that an angle in degrees is quantized to the nearest tick."""
+        ticks = round((degrees % 360) * RotorAngle.TOTAL_TICKS / 360)
+
+        assert RotorAngle.from_degrees(degrees) == RotorAngle.from_ticks(ticks)
+
+    @pytest.mark.parametrize("degrees", [0, 1.8, 90, 359.9, -1.8, 720, 10.123])
+    def test_from_micro_degrees_matches_from_degrees(self, degrees):
+        """Test that integer and floating point angles are quantized to the same tick."""
+        micro_degrees = round(degrees * 1000000)
+
+        assert RotorAngle.from_micro_degrees(micro_degrees) == RotorAngle.from_degrees(degrees)
+
+    def test_from_degrees_rounds_half_up(self):
+        """Test that an angle exactly half way between two ticks is rounded up."""
+        half_tick = 360 / (2 * RotorAngle.TOTAL_TICKS)
+
+        assert RotorAngle.from_degrees(half_tick) == RotorAngle.from_ticks(1)
+
+    @pytest.mark.parametrize("degrees", [0, 1, 90, 359, 360, -1, -450, 1000])
+    def test_from_degrees_integer_matches_float(self, degrees):
+        """Test that integer angles are quantized to the same tick as the equivalent float."""
+        assert RotorAngle.from_degrees(degrees) == RotorAngle.from_degrees(float(degrees))
+
+    @pytest.mark.parametrize("steps, microsteps_per_step, sector, ticks_in_sector", [
+        (0,    1,  1,                        0),
+        (5,    1,  6,                        0),
+        (-1,   1,  RotorAngle.SECTOR_COUNT,  0),
+        (200,  1,  1,                        0),
+        (3,    4,  1,                        3 * RotorAngle.SECTOR_TICKS // 4),
+        (-1,   16, RotorAngle.SECTOR_COUNT,  15 * RotorAngle.SECTOR_TICKS // 16),
+    ])
+    def test_from_steps(self, steps, microsteps_per_step, sector, ticks_in_sector):
+        """Test that a number of micro-steps is converted exactly to sector and position."""
+        angle = RotorAngle.from_steps(steps, microsteps_per_step)
+
+        assert angle.sector == sector
+        assert angle.sector_position_in_ticks == ticks_in_sector
+
+    def test_from_degrees_just_below_full_circle(self):
+        """Test that an angle rounding up to a full circle wraps to the reference position."""
+        angle = RotorAngle.from_degrees(360 - 1e-9)
+
+        assert angle == RotorAngle(sector=1, ticks=0)
+
+
+class TestRotorAngleMovement:
+    """Test the in-place movements of a RotorAngle."""
+
+    def test_move_one_sector_wraps_around(self):
+        """Test that moving past either end of the circle wraps around."""
+        angle = RotorAngle(sector=RotorAngle.SECTOR_COUNT, ticks=7)
+        angle.move_one_sector(clockwise=True)
+        assert angle == RotorAngle(sector=1, ticks=7)
+
+        angle.move_one_sector(clockwise=False)
+        assert angle == RotorAngle(sector=RotorAngle.SECTOR_COUNT, ticks=7)
+
+    @pytest.mark.parametrize("clockwise, sector", [(True, 1), (False, RotorAngle.SECTOR_COUNT)])
+    def test_rotate_to_sector_boundary(self, clockwise, sector):
+        """Test that rotating to the sector boundary picks the boundary in the direction of rotation."""
+        angle = RotorAngle(sector=RotorAngle.SECTOR_COUNT, ticks=RotorAngle.HALF_SECTOR_TICKS)
+        angle.rotate_to_sector_boundary(clockwise)
+
+        assert angle == RotorAngle(sector=sector, ticks=0)
+
+    def test_rotate_within_sector(self):
+        """Test that moving within a sector keeps the sector and replaces the position."""
+        angle = RotorAngle(sector=RotorAngle.SECTOR_COUNT, ticks=7)
+        angle.rotate_within_sector(RotorAngle.SECTOR_TICKS - 1)
+
+        assert angle == RotorAngle(sector=RotorAngle.SECTOR_COUNT, ticks=RotorAngle.SECTOR_TICKS - 1)
+
+        angle.rotate_within_sector(0)
+        assert angle == RotorAngle(sector=RotorAngle.SECTOR_COUNT, ticks=0)
+
+
+class TestRotorAngleComparison:
+    """Test comparing and hashing RotorAngle instances."""
+
+    def test_rotor_angle_is_not_hashable(self):
+        """Test that mutable angles cannot be used as keys."""
+        with pytest.raises(TypeError):
+            hash(RotorAngle(sector=3, ticks=5))
+
+    def test_to_ticks_round_trip(self):
+        """Test that the tick count identifies the angle."""
+        angle = RotorAngle(sector=3, ticks=5)
+
+        assert angle.to_ticks == 2 * RotorAngle.SECTOR_TICKS + 5
+        assert RotorAngle.from_ticks(angle.to_ticks) == angle
+
+    def test_ordering(self):
+        """Test that angles are ordered by their position clockwise from the reference."""
+        angles = [RotorAngle(sector=2, ticks=0), RotorAngle(sector=1, ticks=9), RotorAngle(sector=1, ticks=3)]
+
+        assert sorted(angles) == [RotorAngle(sector=1, ticks=3), RotorAngle(sector=1, ticks=9), RotorAngle(sector=2, ticks=0)]
+        assert angles[1] < angles[0] and angles[0] > angles[1]
+        assert angles[0] <= RotorAngle(sector=2, ticks=0) <= angles[0]
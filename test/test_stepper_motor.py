@@ -15,9 +15,10 @@ source_dir = os.path.join(parent_dir, 'src')
 sys.path.insert(0, parent_dir)
 sys.path.insert(0, source_dir)
 
-# Before importing stepper_motor, replace machine module with our mock
-import machine_mock
-sys.modules['machine'] = machine_mock
+# Before importing stepper_motor, replace machine and micropython modules with our mocks
+import machine_mock, micropython_mock
+sys.modules['machine']     = machine_mock
+sys.modules['micropython'] = micropython_mock
 
 # We can only now import the modules that import the 'machine' module
 from stepper_motor import StepperMotor
@@ -107,15 +108,14 @@ class TestRotorAlignment:
         # Motor starts aligned
         assert self.motor.is_aligned
 
-        # Track operations before alignment
-        ops_before = machine_mock.get_all_operations()
+        # Count operations before alignment
+        num_ops_before = machine_mock.count_all_operations()
 
         # Try to align (should be no-op)
         self.motor.align_rotor("cw")
 
         # Check no new operations occurred
-        ops_after = machine_mock.get_all_operations()
-        assert ops_before == ops_after
+        assert machine_mock.count_all_operations() == num_ops_before
 
     @patch('stepper_motor.StepperMotor.is_aligned', new_callable=lambda: property(lambda self: False))
     def test_align_rotor_clockwise(self, mock_aligned):
@@ -186,6 +186,37 @@ class TestSectorRotation:
         assert self.motor.rotor_angle.sector == initial_sector
         assert mock_sleep.call_count == 0
 
+    @patch('time.sleep')
+    def test_rotate_sectors_microstepping_duties(self, mock_sleep):
+        """Test that micro-stepping applies the currents from the electric cycle."""
+        machine_mock.reset_all_tracking()
+
+        # Rotate 1 sector clockwise in 4 micro-steps
+        self.motor._rotate_full_steps(1, 0.04, 4)
+
+        stride  = StepperMotor.MAX_MICROSTEPS // 4
+        entries = [self.motor.electric_cycle[(k + 1) * stride] for k in range(4)]
+
+        ops     = machine_mock.get_all_operations()
+        pwm_ops = [op for op in ops['pwm_operations'] if op['type'] == 'duty_set']
+        assert [op['duty_u16'] for op in pwm_ops if op['pin'] == 2] == [int(abs(IA) * 65535) for IA, _ in entries]
+        assert [op['duty_u16'] for op in pwm_ops if op['pin'] == 5] == [int(abs(IB) * 65535) for _, IB in entries]
+        assert mock_sleep.call_count == 4
+
+    @patch('time.sleep')
+    def test_rotate_sectors_reuses_step_plans(self, mock_sleep):
+        """Test that the micro-step settings are worked out once for each place in the electric cycle."""
+        machine_mock.reset_all_tracking()
+
+        # Rotate 2 electric cycles (8 sectors) clockwise in 4 micro-steps
+        self.motor._rotate_full_steps(8, 0.04, 4)
+
+        # One step plan for each quarter of the electric cycle, applied twice
+        assert len(self.motor._step_plans) == 4
+        ops     = machine_mock.get_all_operations()
+        pwm_ops = [op['duty_u16'] for op in ops['pwm_operations'] if op['type'] == 'duty_set']
+        assert pwm_ops[:len(pwm_ops) // 2] == pwm_ops[len(pwm_ops) // 2:]
+
     @patch('time.sleep')
     def test_rotate_sectors_infinite(self, mock_sleep):
         """Test that infinite rotation works (at least starts)."""
@@ -218,15 +249,14 @@ class TestMicrostepPositioning:
         """Test that rotating to current position is a no-op."""
         current_ticks = self.motor.rotor_angle.sector_position_in_ticks
 
-        # Get operations before
-        ops_before = machine_mock.get_all_operations()
+        # Count operations before
+        num_ops_before = machine_mock.count_all_operations()
 
         # Rotate to same position
         self.motor._rotate_in_sector(current_ticks)
 
         # Should be no new operations
-        ops_after = machine_mock.get_all_operations()
-        assert ops_before == ops_after
+        assert machine_mock.count_all_operations() == num_ops_before
 
     def test_rotate_in_sector_to_middle(self):
         """Test positioning to middle of sector."""
@@ -261,6 +291,32 @@ class TestMicrostepPositioning:
         assert len(pwm_ops) == 2
         # We don't test exact values as they depend on math calculations
 
+    def test_rotate_in_sector_uses_electric_cycle_on_microstep(self):
+        """Test that a target on a micro-step uses the currents from the electric cycle."""
+        # Position to the 5th micro-step of the sector
+        target_ticks = 5 * RotorAngle.SECTOR_TICKS // StepperMotor.MAX_MICROSTEPS
+
+        with patch.object(self.motor, 'current_calculator') as mock_calculator:
+            self.motor._rotate_in_sector(target_ticks)
+        mock_calculator.assert_not_called()
+
+        # Check PWM duty cycles match the 5th entry of the electric cycle
+        IA, IB  = self.motor.electric_cycle[5]
+        ops     = machine_mock.get_all_operations()
+        pwm_ops = [op for op in ops['pwm_operations'] if op['type'] == 'duty_set']
+        assert [op['duty_u16'] for op in pwm_ops if op['pin'] == 2] == [int(abs(IA) * 65535)]
+        assert [op['duty_u16'] for op in pwm_ops if op['pin'] == 5] == [int(abs(IB) * 65535)]
+
+    def test_rotate_in_sector_between_microsteps(self):
+        """Test that a target between micro-steps calculates the currents for the exact position."""
+        target_ticks = RotorAngle.SECTOR_TICKS // StepperMotor.MAX_MICROSTEPS + 1
+
+        with patch.object(self.motor, 'current_calculator', return_value=(0.5, 0.5)) as mock_calculator:
+            self.motor._rotate_in_sector(target_ticks)
+
+        mock_calculator.assert_called_once_with(0.25 * target_ticks / RotorAngle.SECTOR_TICKS)
+        assert self.motor.rotor_angle.sector_position_in_ticks == target_ticks
+
 
 class TestSpinRotor:
     """Test continuous spinning functionality."""
@@ -298,6 +354,54 @@ class TestSpinRotor:
         # Should call rotate with 0 sectors
         mock_rotate.assert_called_with(0, 0.005, 1)
 
+    @patch('time.sleep')
+    @patch.object(StepperMotor, '_rotate_full_steps')
+    def test_spin_rotor_with_acceleration(self, mock_rotate, mock_sleep):
+        """Test that accelerating passes a ramp of step durations down to the target speed."""
+        # Spin 1 revolution at 30 RPM clockwise, reaching full speed at 60 RPM per second
+        self.motor.spin_rotor(1, 30, "cw", acceleration=60)
+
+        (num_fullsteps, time_per_step, num_microsteps, ramp), _ = mock_rotate.call_args
+        assert (num_fullsteps, time_per_step, num_microsteps) == (200, 0.01, 1)
+
+        # Reaching 30 RPM at 60 RPM/s takes 0.5s, during which the rotor turns 25 full steps
+        assert len(ramp) == 25
+        assert ramp[0] == pytest.approx(0.0676)
+        assert all(earlier > later > time_per_step for earlier, later in zip(ramp, ramp[1:]))
+
+        # A rotation too short to reach full speed only gets the part of the ramp it can use
+        self.motor.spin_rotor(0.05, 30, "cw", acceleration=60)
+        (num_fullsteps, _, _, ramp), _ = mock_rotate.call_args
+        assert (num_fullsteps, len(ramp)) == (10, 5)
+
+    @patch('time.sleep')
+    @patch.object(StepperMotor, '_rotate_full_steps')
+    def test_spin_rotor_with_acceleration_when_micro_stepping(self, mock_rotate, mock_sleep):
+        """Test that the ramp stops at the slowest speed the micro-stepping allows."""
+        # At 300 RPM a full step is 1ms, but 4 micro-steps take at least 4 * MIN_DELAY
+        self.motor.spin_rotor(1, 300, "cw", num_microsteps=4, acceleration=10)
+
+        (_, _, num_microsteps, ramp), _ = mock_rotate.call_args
+        assert num_microsteps == 4
+        assert 0 < len(ramp) < 10
+        assert all(step_duration > 4 * StepperMotor.MIN_DELAY for step_duration in ramp)
+
+        # With 16 micro-steps even the first step of the ramp is faster than allowed
+        self.motor.spin_rotor(1, 30, "cw", num_microsteps=16, acceleration=60)
+        (_, _, _, ramp), _ = mock_rotate.call_args
+        assert ramp == []
+
+    @patch('time.sleep')
+    def test_rotate_full_steps_with_ramp(self, mock_sleep):
+        """Test that a ramp is used to speed up at the start and slow down at the end."""
+        self.motor._rotate_full_steps(6, 0.01, 1, ramp=[0.05, 0.03])
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [0.05, 0.03, 0.01, 0.01, 0.03, 0.05]
+
+        # A ramp too long for the rotation is cut short at the middle
+        mock_sleep.reset_mock()
+        self.motor._rotate_full_steps(3, 0.01, 1, ramp=[0.05, 0.03])
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [0.05, 0.01, 0.05]
+
 
 class TestTurnRotor:
     """Test arbitrary angle positioning."""
@@ -367,6 +471,37 @@ class TestTurnRotor:
                 # Verify clockwise was chosen (20 degrees cw vs 340 degrees ccw)
                 mock_align.assert_called_with(direction="cw")
 
+    @patch('time.sleep')
+    def test_turn_rotor_closest_direction_half_turn(self, mock_sleep):
+        """Test that 'closest' turns clockwise when both directions are exactly as far."""
+        self.motor.rotor_angle = RotorAngle(sector=2, ticks=RotorAngle.SECTOR_TICKS // 4)
+        target_angle = self.motor.rotor_angle.to_degrees + 180
+
+        with patch.object(self.motor, 'align_rotor') as mock_align:
+            with patch.object(self.motor, '_rotate_full_steps'):
+                self.motor.turn_rotor(target_angle, "closest")
+                mock_align.assert_called_with(direction="cw")
+
+    @patch('time.sleep')
+    def test_run_trajectory_settles_once(self, mock_sleep):
+        """Test that a trajectory ends where the individual moves would, settling only at the end."""
+        moves = [(10, "cw", 4), (12.5, "closest", 4), (3.3, "ccw", 1)]
+
+        # Perform the moves one by one
+        for move in moves:
+            self.motor.turn_rotor(*move)
+        expected_angle = self.motor.rotor_angle
+        expected_sleeps = mock_sleep.call_count
+
+        # Perform the same moves as a trajectory, with a fresh motor
+        mock_sleep.reset_mock()
+        motor = StepperMotor(ain1=0, ain2=1, pwma=2, bin1=3, bin2=4, pwmb=5)
+        motor.run_trajectory(moves)
+
+        assert motor.rotor_angle == expected_angle
+        assert mock_sleep.call_count == expected_sleeps - (len(moves) - 1)
+        assert mock_sleep.call_args.args[0] == StepperMotor.MIN_DELAY
+
 
 class TestEnergizePhase:
     """Test phase energization (hardware control)."""
@@ -387,15 +522,13 @@ class TestEnergizePhase:
         ops = machine_mock.get_all_operations()
 
         # Check pin directions (ain1=1, ain2=0 for positive)
-        pin_ops = [op for op in ops['pin_operations'] if op['type'] == 'value_set']
-        ain1_op = next((op for op in pin_ops if op['pin'] == 0), None)
-        ain2_op = next((op for op in pin_ops if op['pin'] == 1), None)
+        ain1_op = next((op for op in ops['pin_operations'] if op['type'] == 'value_set' and op['pin'] == 0), None)
+        ain2_op = next((op for op in ops['pin_operations'] if op['type'] == 'value_set' and op['pin'] == 1), None)
         assert ain1_op['value'] == 1
         assert ain2_op['value'] == 0
 
         # Check PWM duty (should be max)
-        pwm_ops = [op for op in ops['pwm_operations'] if op['type'] == 'duty_set']
-        pwma_op = next((op for op in pwm_ops if op['pin'] == 2), None)
+        pwma_op = next((op for op in ops['pwm_operations'] if op['type'] == 'duty_set' and op['pin'] == 2), None)
         assert pwma_op['duty_u16'] == 65535
 
     def test_energize_phase_a_negative(self):
@@ -405,15 +538,13 @@ class TestEnergizePhase:
         ops = machine_mock.get_all_operations()
 
         # Check pin directions (ain1=0, ain2=1 for negative)
-        pin_ops = [op for op in ops['pin_operations'] if op['type'] == 'value_set']
-        ain1_op = next((op for op in pin_ops if op['pin'] == 0), None)
-        ain2_op = next((op for op in pin_ops if op['pin'] == 1), None)
+        ain1_op = next((op for op in ops['pin_operations'] if op['type'] == 'value_set' and op['pin'] == 0), None)
+        ain2_op = next((op for op in ops['pin_operations'] if op['type'] == 'value_set' and op['pin'] == 1), None)
         assert ain1_op['value'] == 0
         assert ain2_op['value'] == 1
 
         # Check PWM duty (should be max, absolute value)
-        pwm_ops = [op for op in ops['pwm_operations'] if op['type'] == 'duty_set']
-        pwma_op = next((op for op in pwm_ops if op['pin'] == 2), None)
+        pwma_op = next((op for op in ops['pwm_operations'] if op['type'] == 'duty_set' and op['pin'] == 2), None)
         assert pwma_op['duty_u16'] == 65535
 
     def test_energize_phase_half_power(self):
@@ -423,8 +554,7 @@ class TestEnergizePhase:
         ops = machine_mock.get_all_operations()
 
         # Check PWM duty (should be half)
-        pwm_ops = [op for op in ops['pwm_operations'] if op['type'] == 'duty_set']
-        pwmb_op = next((op for op in pwm_ops if op['pin'] == 5), None)
+        pwmb_op = next((op for op in ops['pwm_operations'] if op['type'] == 'duty_set' and op['pin'] == 5), None)
         assert pwmb_op['duty_u16'] == 32767  # Half of 65535
 
     def test_energize_phase_zero_power(self):
@@ -434,8 +564,7 @@ class TestEnergizePhase:
         ops = machine_mock.get_all_operations()
 
         # Check PWM duty (should be 0)
-        pwm_ops = [op for op in ops['pwm_operations'] if op['type'] == 'duty_set']
-        pwma_op = next((op for op in pwm_ops if op['pin'] == 2), None)
+        pwma_op = next((op for op in ops['pwm_operations'] if op['type'] == 'duty_set' and op['pin'] == 2), None)
         assert pwma_op['duty_u16'] == 0
 
 